@@ -20,8 +20,20 @@
   const CAM_EASE = 0.08;
   const BOT_COUNT = 3;
   const COUNTDOWN_MS = 3200;
+  const FIXED_DT_MS = 1000 / 60;
+  const MAX_FRAME_MS = 100;
+  const IDLE_FRAME_MS = 100;
+  const TIMER_LOOP = new URLSearchParams(location.search).has("timerloop");
   const OBSTACLE_SPACING = [280, 520];
   const MUTE_DEFAULT = false;
+  // Derived once from the tuning values above.
+  const FRICTION_KEEP = 1 - FRICTION;
+  const RAMP_VY = JUMP_VY * 1.1;
+  const CAM_LEAD = VPW * 0.3;
+  const ENGINE_GAIN_PER_SPEED = 0.1 / MAX_SPEED;
+  const BEEP_VOICES = 8;
+  const CULL_MARGIN = 200;
+  const BEST_KEY = "camcookie-dirt-dash-best";
 
   // -------------------- Helpers --------------------
   const clamp = (v, lo, hi) => v < lo ? lo : (v > hi ? hi : v);
@@ -39,6 +51,9 @@
       this.engineOnFlag = false;
       this.engineHz = 0;
       this.engineTargetHz = 0;
+      this.lastEngineHz = -1;
+      this.voices = null;
+      this.nextVoice = 0;
     }
     ensureContext() {
       if (this.ctx) return;
@@ -85,6 +100,7 @@
       o.connect(lp); lp.connect(g); g.connect(this.ctx.destination);
       o.start();
       this.engineNodes = { o, g, lp };
+      this.lastEngineHz = -1;
     }
     engineOff() {
       this.engineOnFlag = false;
@@ -100,28 +116,46 @@
       const hz = clamp(40 + speed * 12, 40, 320);
       this.engineTargetHz = hz;
       this.engineHz += (this.engineTargetHz - this.engineHz) * 0.2;
+      // Below ~2 Hz the pitch change is inaudible; skip rescheduling.
+      if (Math.abs(this.engineHz - this.lastEngineHz) < 2) return;
+      this.lastEngineHz = this.engineHz;
       try { o.frequency.setTargetAtTime(this.engineHz, this.ctx.currentTime, 0.05); }
       catch(e){ o.frequency.value = this.engineHz; }
-      const tgt = 0.04 + (speed / MAX_SPEED) * 0.1;
+      const tgt = 0.04 + speed * ENGINE_GAIN_PER_SPEED;
       try { g.gain.setTargetAtTime(tgt, this.ctx.currentTime, 0.08); }
       catch(e){ g.gain.value = tgt; }
     }
+    // Beeps reuse a fixed ring of always-running sine voices; each note is
+    // just a gain envelope scheduled on the audio clock, so no nodes or JS
+    // timers are created per beep.
+    makeVoices() {
+      this.voices = [];
+      this.nextVoice = 0;
+      for (let i = 0; i < BEEP_VOICES; i++) {
+        const o = this.ctx.createOscillator();
+        const g = this.ctx.createGain();
+        o.type = "sine";
+        g.gain.value = 0;
+        o.connect(g); g.connect(this.ctx.destination);
+        o.start();
+        this.voices.push({ o, g });
+      }
+    }
     beep(freq, dur, ramp, startTime=null) {
       this.ensureContext();
       if (!this.ctx) return;
+      if (!this.voices) this.makeVoices();
+      const { o, g } = this.voices[this.nextVoice];
+      this.nextVoice = (this.nextVoice + 1) % BEEP_VOICES;
       const t0 = startTime ?? this.ctx.currentTime;
-      const o = this.ctx.createOscillator();
-      const g = this.ctx.createGain();
-      o.type = "sine";
-      o.frequency.value = freq;
-      g.gain.value = 0.0001;
-      o.connect(g); g.connect(this.ctx.destination);
-      o.start(t0);
       try {
+        o.frequency.setValueAtTime(freq, t0);
+        g.gain.cancelScheduledValues(t0);
+        g.gain.setValueAtTime(0.0001, t0);
         g.gain.linearRampToValueAtTime(0.12, t0 + ramp);
         g.gain.linearRampToValueAtTime(0.0001, t0 + dur);
+        g.gain.setValueAtTime(0, t0 + dur);
       } catch(e){}
-      setTimeout(()=>{ try { o.stop(); } catch(e){} }, (dur+0.05)*1000);
     }
   }
   const SOUND = new SoundEngine();
@@ -143,12 +177,15 @@
 
   // Layers
   const LAYER_BG = document.createElementNS(SVGNS, "g");
+  const LAYER_WORLD = document.createElementNS(SVGNS, "g");
   const LAYER_TERRAIN = document.createElementNS(SVGNS, "g");
   const LAYER_OBS = document.createElementNS(SVGNS, "g");
   const LAYER_ACTORS = document.createElementNS(SVGNS, "g");
   const LAYER_HUD = document.createElementNS(SVGNS, "g");
   const LAYER_OVERLAY = document.createElementNS(SVGNS, "g");
-  [LAYER_BG, LAYER_TERRAIN, LAYER_OBS, LAYER_ACTORS, LAYER_HUD, LAYER_OVERLAY].forEach(g=>rootSvg.appendChild(g));
+  // World-space layers scroll together under one camera transform.
+  LAYER_WORLD.append(LAYER_TERRAIN, LAYER_OBS, LAYER_ACTORS);
+  [LAYER_BG, LAYER_WORLD, LAYER_HUD, LAYER_OVERLAY].forEach(g=>rootSvg.appendChild(g));
   LAYER_BG.appendChild(bgRect);
 
   // Global UI prevention
@@ -156,190 +193,279 @@
   document.documentElement.style.userSelect = "none";
 
   // -------------------- Terrain --------------------
-  function terrainY(x) {
+  // The height field is static, so it is sampled once into a table and
+  // looked up with linear interpolation instead of three sin() per call.
+  const sin = Math.sin;
+  function terrainYExact(x) {
     return (GROUND_Y
-      + 90 * Math.sin((x + 300) / 260.0)
-      + 48 * Math.sin((x + 800) / 110.0)
-      + 24 * Math.sin((x - 1200) / 55.0));
+      + 90 * sin((x + 300) / 260.0)
+      + 48 * sin((x + 800) / 110.0)
+      + 24 * sin((x - 1200) / 55.0));
   }
-  function slopeAt(x, dx=1.0) {
-    const y1 = terrainY(x - dx);
-    const y2 = terrainY(x + dx);
-    return (y2 - y1) / (2*dx);
+  const TERRAIN_SAMPLE = 4;
+  const INV_SAMPLE = 1 / TERRAIN_SAMPLE;
+  const TERRAIN_SAMPLES = Math.ceil((TRACK_LEN + VPW) / TERRAIN_SAMPLE) + 2;
+  const TERRAIN_TABLE = new Float64Array(TERRAIN_SAMPLES);
+  for (let i = 0; i < TERRAIN_SAMPLES; i++) TERRAIN_TABLE[i] = terrainYExact(i * TERRAIN_SAMPLE);
+
+  function terrainY(x) {
+    const f = x * INV_SAMPLE;
+    const i = f | 0;
+    if (i < 0 || i >= TERRAIN_SAMPLES - 1) return terrainYExact(x);
+    const y0 = TERRAIN_TABLE[i];
+    return y0 + (TERRAIN_TABLE[i + 1] - y0) * (f - i);
+  }
+  function slopeAt(x) {
+    const i = Math.round(x * INV_SAMPLE);
+    if (i < 1 || i >= TERRAIN_SAMPLES - 1) return (terrainYExact(x + 1) - terrainYExact(x - 1)) * 0.5;
+    return (TERRAIN_TABLE[i + 1] - TERRAIN_TABLE[i - 1]) * (INV_SAMPLE * 0.5);
+  }
+
+  // Body tilt (whole degrees) per slope bin; slopes of this terrain stay
+  // well inside +/-1.5 and anything steeper is clamped to the end bins.
+  const TILT_LUT_RES = 64;
+  const TILT_LUT_SPAN = 1.5;
+  const TILT_LUT_LAST = 2 * TILT_LUT_SPAN * TILT_LUT_RES;
+  const TILT_LUT = new Float64Array(TILT_LUT_LAST + 1);
+  for (let i = 0; i <= TILT_LUT_LAST; i++) {
+    const s = i / TILT_LUT_RES - TILT_LUT_SPAN;
+    TILT_LUT[i] = Math.round(Math.atan2(-s, 1.0) * 180/Math.PI * 0.6);
+  }
+  function tiltAt(x) {
+    const i = Math.round((slopeAt(x) + TILT_LUT_SPAN) * TILT_LUT_RES);
+    return TILT_LUT[i < 0 ? 0 : (i > TILT_LUT_LAST ? TILT_LUT_LAST : i)];
   }
 
   // -------------------- Obstacles --------------------
-  class Obstacle {
-    constructor(kind, x) {
-      this.kind = kind;
-      this.x = x;
-      this.y = terrainY(x);
-      this.node = null;
+  // Obstacles never move, so each kind is drawn as one combined <path>.
+  // The field stores them as parallel typed arrays (kind, x, ground y)
+  // sorted by x; collision is a free function over one index.
+  const OB_ROCK = 0, OB_LOG = 1, OB_RAMP = 2;
+  const OB_REACH = 80;
+  // Weighted pick table: rocks and logs come up twice as often as ramps.
+  const OBSTACLE_KINDS = Uint8Array.of(OB_ROCK, OB_LOG, OB_RAMP, OB_ROCK, OB_LOG);
+  const OBSTACLE_STYLE = [
+    { fill: "#7d7f86", stroke: "#2f3138" },
+    { fill: "#6b4b2a", stroke: "#3e2a17" },
+    { fill: "#d1a14f", stroke: "#6a4c20" },
+  ];
+  function obstaclePath(kind, x, y) {
+    y = Math.round(y);
+    if (kind === OB_ROCK) {
+      return `M${x-18} ${y-20}a18 18 0 1 0 36 0a18 18 0 1 0 -36 0z`;
+    } else if (kind === OB_LOG) {
+      return `M${x-22} ${y-22}h42a6 6 0 0 1 6 6v8a6 6 0 0 1 -6 6h-42a6 6 0 0 1 -6 -6v-8a6 6 0 0 1 6 -6z`;
+    } else {
+      return `M${x-10} ${y}H${x+100}V${y-60}z`;
     }
-    render(group) {
-      if (this.node) { this.updateGraphics(); return; }
-      if (this.kind === "rock") {
-        this.node = document.createElementNS(SVGNS, "circle");
-        this.node.setAttribute("r", 18);
-        this.node.setAttribute("fill", "#7d7f86");
-        this.node.setAttribute("stroke", "#2f3138");
-        this.node.setAttribute("stroke-width", 3);
-      } else if (this.kind === "log") {
-        this.node = document.createElementNS(SVGNS, "rect");
-        this.node.setAttribute("width", 54);
-        this.node.setAttribute("height", 20);
-        this.node.setAttribute("rx", 6);
-        this.node.setAttribute("fill", "#6b4b2a");
-        this.node.setAttribute("stroke", "#3e2a17");
-        this.node.setAttribute("stroke-width", 3);
-      } else {
-        this.node = document.createElementNS(SVGNS, "polygon");
-        this.node.setAttribute("fill", "#d1a14f");
-        this.node.setAttribute("stroke", "#6a4c20");
-        this.node.setAttribute("stroke-width", 3);
-      }
-      group.appendChild(this.node);
-      this.updateGraphics();
-    }
-    updateGraphics() {
-      const y = this.y;
-      if (this.kind === "rock") {
-        this.node.setAttribute("cx", this.x);
-        this.node.setAttribute("cy", y - 20);
-      } else if (this.kind === "log") {
-        this.node.setAttribute("x", this.x - 28);
-        this.node.setAttribute("y", y - 22);
-      } else {
-        const w=100, h=60;
-        const pts = `${this.x-10},${y} ${this.x+w},${y} ${this.x+w},${y-h}`;
-        this.node.setAttribute("points", pts);
-      }
-    }
-    collides(px, py) {
-      const y = this.y;
-      if (this.kind === "rock") {
-        const dx = px - this.x;
-        const dy = (py - 20) - (y - 20);
-        return (dx*dx + dy*dy) < (24*24);
-      } else if (this.kind === "log") {
-        return (this.x - 28 <= px && px <= this.x + 26) && (y - 22 <= py && py <= y - 2);
-      } else {
-        return (this.x - 10 <= px && px <= this.x + 100) && (py >= y - 64 && py <= y);
-      }
+  }
+  // Hit boxes relative to the obstacle's ground point.
+  const ROCK_R2 = 24 * 24;
+  const LOG_DX_LO = -28, LOG_DX_HI = 26, LOG_DY_LO = -22, LOG_DY_HI = -2;
+  const RAMP_DX_LO = -10, RAMP_DX_HI = 100, RAMP_DY_LO = -64;
+  function obstacleHit(kind, ox, oy, px, py) {
+    const dx = px - ox, dy = py - oy;
+    if (kind === OB_ROCK) {
+      return (dx*dx + dy*dy) < ROCK_R2;
+    } else if (kind === OB_LOG) {
+      return LOG_DX_LO <= dx && dx <= LOG_DX_HI && LOG_DY_LO <= dy && dy <= LOG_DY_HI;
+    } else {
+      return RAMP_DX_LO <= dx && dx <= RAMP_DX_HI && RAMP_DY_LO <= dy && dy <= 0;
     }
   }
   class ObstacleField {
-    constructor(length) { this.length = length; this.items = []; this.generate(); }
+    constructor(length) { this.length = length; this.count = 0; this.markup = ""; this.rendered = false; this.generate(); }
     generate() {
+      const [gapLo, gapHi] = OBSTACLE_SPACING;
+      const lastKind = OBSTACLE_KINDS.length - 1;
+      // Every gap is at least gapLo, which bounds the obstacle count, so the
+      // arrays are allocated once and trimmed to the real count after.
+      const cap = Math.ceil((this.length - 200 - 400) / gapLo) + 1;
+      const kinds = new Uint8Array(cap), xs = new Float64Array(cap), ys = new Float64Array(cap);
+      const d = [[], [], []];
+      let n = 0;
       let x = 400;
       while (x < this.length - 200) {
-        x += randInt(...OBSTACLE_SPACING);
-        const kind = ["rock", "log", "ramp", "rock", "log"][randInt(0,4)];
-        this.items.push(new Obstacle(kind, x));
+        x += randInt(gapLo, gapHi);
+        const kind = OBSTACLE_KINDS[randInt(0, lastKind)];
+        const y = terrainY(x);
+        kinds[n] = kind; xs[n] = x; ys[n] = y; n++;
+        d[kind].push(obstaclePath(kind, x, y));
       }
+      // Generation walks forward, so xs is already sorted.
+      this.count = n;
+      this.kinds = kinds.subarray(0, n);
+      this.xs = xs.subarray(0, n);
+      this.ys = ys.subarray(0, n);
+      // Geometry is fixed from here on, so the markup is built once too.
+      this.markup = [OB_RAMP, OB_LOG, OB_ROCK].map(kind => {
+        const st = OBSTACLE_STYLE[kind];
+        return `<path d="${d[kind].join("")}" fill="${st.fill}" stroke="${st.stroke}" stroke-width="3"/>`;
+      }).join("");
+    }
+    render(group) {
+      if (this.rendered) return;
+      group.innerHTML = this.markup;
+      this.rendered = true;
     }
-    render(group) { this.items.forEach(o=>o.render(group)); }
   }
 
   // -------------------- Bike / Actor --------------------
+  // Shared bike shape, laid out around the bike origin and instanced with
+  // <use>; the body has no fill of its own so it takes the bike's colour.
+  const bikeShape = document.createElementNS(SVGNS,"g");
+  bikeShape.setAttribute("id","bike");
+  const bikeBody = document.createElementNS(SVGNS,"rect");
+  bikeBody.setAttribute("x",-30); bikeBody.setAttribute("y",-10);
+  bikeBody.setAttribute("width",60); bikeBody.setAttribute("height",20); bikeBody.setAttribute("rx",8);
+  bikeBody.setAttribute("stroke","#1b2a38"); bikeBody.setAttribute("stroke-width",3);
+  bikeShape.appendChild(bikeBody);
+  [18, -18].forEach(cx => {
+    const w = document.createElementNS(SVGNS,"circle");
+    w.setAttribute("cx",cx); w.setAttribute("cy",18); w.setAttribute("r",14);
+    w.setAttribute("fill","#222831"); w.setAttribute("stroke","#0d1116"); w.setAttribute("stroke-width",2);
+    bikeShape.appendChild(w);
+  });
+  defs.appendChild(bikeShape);
+
   class Bike {
     constructor(name, color="#7fc8ff", isBot=false) {
       this.name = name; this.color = color; this.isBot = isBot;
       this.reset();
+      // Each bike is one <use> of the shared shape plus its name label;
+      // draw() moves the group and tilts the shape via SVGTransform objects.
       this.group = document.createElementNS(SVGNS,"g");
-      this.body = document.createElementNS(SVGNS,"rect");
-      this.body.setAttribute("width",60); this.body.setAttribute("height",20);
-      this.body.setAttribute("rx",8); this.body.setAttribute("fill",color);
-      this.body.setAttribute("stroke","#1b2a38"); this.body.setAttribute("stroke-width",3);
-      this.wheelF = document.createElementNS(SVGNS,"circle");
-      this.wheelB = document.createElementNS(SVGNS,"circle");
-      [this.wheelF, this.wheelB].forEach(w => { w.setAttribute("r",14); w.setAttribute("fill","#222831"); w.setAttribute("stroke","#0d1116"); w.setAttribute("stroke-width",2); });
+      this.tf = rootSvg.createSVGTransform();
+      this.group.transform.baseVal.appendItem(this.tf);
+      this.shape = document.createElementNS(SVGNS,"use");
+      this.shape.setAttribute("href","#bike"); this.shape.setAttribute("fill",color);
+      this.tilt = rootSvg.createSVGTransform();
+      this.shape.transform.baseVal.appendItem(this.tilt);
       this.label = document.createElementNS(SVGNS,"text");
       this.label.textContent = this.name; this.label.setAttribute("fill","#e6f2ff");
       this.label.setAttribute("font-size","22px"); this.label.setAttribute("text-anchor","middle");
-      this.group.append(this.body, this.wheelF, this.wheelB, this.label);
+      this.label.setAttribute("x",0); this.label.setAttribute("y",-28);
+      this.group.append(this.shape, this.label);
       LAYER_ACTORS.appendChild(this.group);
+      this.drawnX = NaN; this.drawnY = NaN; this.drawnAngle = NaN;
+      this.visible = true;
     }
     reset() {
       this.x = 40;
       this.y = terrainY(this.x) - 30;
+      this.prevX = this.x; this.prevY = this.y;
       this.vx = 0; this.vy = 0;
       this.onGround = true;
       this.finished = false;
       this.finishTimeMs = null;
-      if (this.isBot) {
-        this.speedBias = Math.random()*(0.88-0.60)+0.60;
-        this.jumpBias = Math.random()*(0.85-0.55)+0.55;
-      }
+      // Assigned for every bike so player and bots share one object shape.
+      this.speedBias = this.isBot ? Math.random()*(0.88-0.60)+0.60 : 1;
+      this.jumpBias = this.isBot ? Math.random()*(0.85-0.55)+0.55 : 0;
+      this.targetSpeed = this.speedBias * MAX_SPEED;
+      this.rngState = randInt(0, 0x7fffffff);
+      this.obIdx = 0;
+    }
+    // Advances one tick; returns true only on the tick the bike finishes.
+    step(dtMs, throttle, brake, wantJump, field, raceMs) {
+      this.prevX = this.x; this.prevY = this.y;
+      if (this.finished) return false;
+      this.updatePhysics(dtMs, throttle, brake, wantJump);
+      if (!this.finished) { this.applyObstacleEffects(field); return false; }
+      this.finishTimeMs = raceMs;
+      return true;
     }
     updatePhysics(dtMs, throttle, brake, wantJump) {
       if (this.finished) return;
-      if (throttle) this.vx += ACCEL;
-      if (brake) this.vx -= BRAKE;
-      if (!throttle && !brake) this.vx *= (1 - FRICTION);
-      this.vx = clamp(this.vx, 0, MAX_SPEED);
-
-      const ground = terrainY(this.x);
-      if (this.onGround) {
-        this.y = ground - 30;
-        if (wantJump) { this.onGround = false; this.vy = -JUMP_VY; }
+      let x = this.x, y = this.y, vx = this.vx, vy = this.vy, onGround = this.onGround;
+      if (throttle) vx += ACCEL;
+      if (brake) vx -= BRAKE;
+      if (!throttle && !brake) vx *= FRICTION_KEEP;
+      vx = clamp(vx, 0, MAX_SPEED);
+
+      const rest = terrainY(x) - 30;
+      if (onGround) {
+        y = rest;
+        if (wantJump) { onGround = false; vy = -JUMP_VY; }
       } else {
-        this.vy += GRAVITY; this.y += this.vy;
-        if (this.y >= ground - 30) { this.y = ground - 30; this.vy = 0; this.onGround = true; }
+        vy += GRAVITY; y += vy;
+        if (y >= rest) { y = rest; vy = 0; onGround = true; }
       }
-      this.x += this.vx;
-      if (this.x >= TRACK_LEN && !this.finished) this.finished = true;
+      x += vx;
+      this.x = x; this.y = y; this.vx = vx; this.vy = vy; this.onGround = onGround;
+      if (x >= TRACK_LEN) this.finished = true;
     }
-    applyObstacleEffects(obstacles) {
-      if (this.finished) return;
-      for (const ob of obstacles) {
-        if (Math.abs(ob.x - this.x) > 80) continue;
-        if (ob.kind === "ramp") {
-          if (ob.collides(this.x, this.y + 28)) {
-            if (this.onGround) {
-              this.onGround = false; this.vy = -(JUMP_VY*1.1);
-              this.vx = Math.min(MAX_SPEED, this.vx + 1.0);
-            }
-          }
+    // Obstacles only act on a grounded bike and the first hit launches it,
+    // so airborne bikes skip the scan and it stops at the first hit.
+    applyObstacleEffects(field) {
+      if (this.finished || !this.onGround) return;
+      const { kinds, xs, ys, count } = field;
+      const px = this.x, py = this.y + 28;
+      // Bikes never move backwards, so the window start only advances.
+      let i = this.obIdx;
+      while (i < count && xs[i] < px - OB_REACH) i++;
+      this.obIdx = i;
+      for (; i < count && xs[i] <= px + OB_REACH; i++) {
+        if (!obstacleHit(kinds[i], xs[i], ys[i], px, py)) continue;
+        if (kinds[i] === OB_RAMP) {
+          this.onGround = false; this.vy = -RAMP_VY;
+          this.vx = Math.min(MAX_SPEED, this.vx + 1.0);
         } else {
-          if (ob.collides(this.x, this.y + 28)) {
-            if (this.onGround) {
-              this.vx = Math.max(0, this.vx - 2.2);
-              this.y -= 6; this.onGround = false; this.vy = -5.0;
-            }
-          }
+          this.vx = Math.max(0, this.vx - 2.2);
+          this.y -= 6; this.onGround = false; this.vy = -5.0;
         }
+        return;
       }
     }
-    botDecide(obsField) {
+    // Per-bike LCG in [0, 1); bot jumps only need cheap, not good, randomness.
+    nextRand() {
+      this.rngState = (Math.imul(this.rngState, 1103515245) + 12345) & 0x7fffffff;
+      return this.rngState / 0x80000000;
+    }
+    botDecide(field) {
       if (!this.isBot || this.finished) return [false,false];
-      const target = this.speedBias * MAX_SPEED;
-      const throttle = (this.vx < target);
+      const throttle = (this.vx < this.targetSpeed);
       const aheadX = this.x + 90 + this.vx * 2.0;
       let needJump = false;
-      for (const ob of obsField.items) {
-        if (ob.x < this.x) continue;
-        if (ob.x > aheadX) break;
-        if (ob.kind === "ramp") {
-          needJump = (Math.random() < (this.jumpBias + 0.1)); break;
+      const { kinds, xs, count } = field;
+      let i = this.obIdx;
+      while (i < count && xs[i] < this.x) i++;
+      for (; i < count; i++) {
+        if (xs[i] > aheadX) break;
+        if (kinds[i] === OB_RAMP) {
+          needJump = (this.nextRand() < (this.jumpBias + 0.1)); break;
         } else {
-          if ((ob.x - this.x) < (60 + this.vx * 1.2)) {
-            needJump = (Math.random() < this.jumpBias); break;
+          if ((xs[i] - this.x) < (60 + this.vx * 1.2)) {
+            needJump = (this.nextRand() < this.jumpBias); break;
           }
         }
       }
       return [throttle, needJump];
     }
-    draw() {
-      const slope = slopeAt(this.x);
-      const angleDeg = Math.atan2(-slope, 1.0) * 180/Math.PI * 0.6;
-      const wf_x = this.x + 18, wf_y = this.y + 18;
-      const wb_x = this.x - 18, wb_y = this.y + 18;
-      this.wheelF.setAttribute("cx", wf_x); this.wheelF.setAttribute("cy", wf_y);
-      this.wheelB.setAttribute("cx", wb_x); this.wheelB.setAttribute("cy", wb_y);
-      this.body.setAttribute("x", this.x - 30); this.body.setAttribute("y", this.y - 10);
-      this.body.setAttribute("transform", `rotate(${angleDeg} ${this.x} ${this.y})`);
-      this.label.setAttribute("x", this.x); this.label.setAttribute("y", this.y - 28);
+    // Positions snap to whole pixels and the tilt to whole degrees; frames
+    // where neither changed leave the DOM untouched. Bikes outside the
+    // camera window are hidden once and skipped until they come back.
+    // `alpha` blends between the last two physics ticks so motion stays
+    // smooth when the display rate differs from the 60 Hz simulation.
+    draw(cameraX, alpha) {
+      if (this.finished) alpha = 1;  // finished bots are no longer stepped
+      const x = this.prevX + (this.x - this.prevX) * alpha;
+      const y = this.prevY + (this.y - this.prevY) * alpha;
+      const onScreen = x > cameraX - CULL_MARGIN && x < cameraX + VPW + CULL_MARGIN;
+      if (onScreen !== this.visible) {
+        this.group.setAttribute("display", onScreen ? "inline" : "none");
+        this.visible = onScreen;
+      }
+      if (!onScreen) return;
+      const ix = Math.round(x), iy = Math.round(y);
+      if (ix !== this.drawnX || iy !== this.drawnY) {
+        this.tf.setTranslate(ix, iy);
+        this.drawnX = ix; this.drawnY = iy;
+      }
+      const angleDeg = tiltAt(x);
+      if (angleDeg !== this.drawnAngle) {
+        this.tilt.setRotate(angleDeg, 0, 0);
+        this.drawnAngle = angleDeg;
+      }
     }
   }
 
@@ -360,12 +486,18 @@
       LAYER_HUD.append(this.rect, this.text);
       const down = (ev)=>{ ev.preventDefault(); SOUND.unlock(); this.active=true; this.rect.setAttribute("fill", active); cb?.("down"); };
       const up = (ev)=>{ ev.preventDefault(); if (this.active){ this.active=false; this.rect.setAttribute("fill", fill); cb?.("up"); } };
-      [this.rect, this.text].forEach(n => {
-        n.addEventListener("pointerdown", down);
-        n.addEventListener("pointerup", up);
-        n.addEventListener("pointerleave", up);
-      });
+      // The label lets pointer events fall through to the rect, so each
+      // button needs only one set of listeners.
+      this.text.setAttribute("pointer-events","none");
+      this.rect.addEventListener("pointerdown", down);
+      this.rect.addEventListener("pointerup", up);
+      this.rect.addEventListener("pointerleave", up);
       this.baseFill = fill; this.activeFill = active;
+      this.w = w; this.h = h;
+    }
+    moveTo(x, y) {
+      this.rect.setAttribute("x",x); this.rect.setAttribute("y",y);
+      this.text.setAttribute("x", x+this.w/2); this.text.setAttribute("y", y+this.h/2+14);
     }
     setOpacity(a){ this.rect.setAttribute("opacity", String(a)); this.text.setAttribute("opacity", String(a)); }
   }
@@ -378,11 +510,17 @@
       this.speedText.setAttribute("x", 40); this.speedText.setAttribute("y", 110); this.speedText.setAttribute("fill","#a6c7ff"); this.speedText.setAttribute("font-size","32px");
       this.nameText.setAttribute("x", VPW-40); this.nameText.setAttribute("y", 60); this.nameText.setAttribute("fill","#e6f2ff"); this.nameText.setAttribute("font-size","40px"); this.nameText.setAttribute("text-anchor","end");
       LAYER_HUD.append(this.timeText, this.speedText, this.nameText);
+      this.lastTime = null; this.lastSpeed = null; this.lastName = null;
     }
+    // Values are compared at display precision before any string is built;
+    // the clock shows tenths of a second and speed whole units, so neither
+    // text changes on every tick.
     update(ms, speed, name) {
-      this.timeText.textContent = `Time: ${fmtTimeMs(ms)}`;
-      this.speedText.textContent = `Speed: ${speed.toFixed(1)}`;
-      this.nameText.textContent = name;
+      const ds = Math.floor(ms / 100);
+      const whole = Math.round(speed);
+      if (ds !== this.lastTime) { this.timeText.textContent = `Time: ${(ds / 10).toFixed(1)}s`; this.lastTime = ds; }
+      if (whole !== this.lastSpeed) { this.speedText.textContent = `Speed: ${whole}`; this.lastSpeed = whole; }
+      if (name !== this.lastName) { this.nameText.textContent = name; this.lastName = name; }
     }
   }
   class Overlays {
@@ -391,12 +529,17 @@
       this.curtain.setAttribute("x",0); this.curtain.setAttribute("y",0);
       this.curtain.setAttribute("width",VPW); this.curtain.setAttribute("height",VPH);
       this.curtain.setAttribute("fill","#0b0e14"); this.curtain.setAttribute("opacity","0.0");
+      // Decorative overlay pieces let touches through to the HUD buttons.
+      this.curtain.setAttribute("pointer-events","none");
       LAYER_OVERLAY.appendChild(this.curtain);
+      this.curtainShown = 0.0;
 
       this.centerText = document.createElementNS(SVGNS,"text");
       this.centerText.setAttribute("x", VPW/2); this.centerText.setAttribute("y", VPH/2);
       this.centerText.setAttribute("fill","#eaf2ff"); this.centerText.setAttribute("font-size","120px"); this.centerText.setAttribute("text-anchor","middle");
+      this.centerText.setAttribute("pointer-events","none");
       LAYER_OVERLAY.appendChild(this.centerText);
+      this.centerShown = "";
 
       this.pauseGroup = document.createElementNS(SVGNS,"g");
       this.pauseBg = document.createElementNS(SVGNS,"rect");
@@ -409,14 +552,18 @@
       this.pauseTitle.setAttribute("x", VPW/2); this.pauseTitle.setAttribute("y", VPH/2-120);
       this.pauseTitle.setAttribute("fill","#e6f2ff"); this.pauseTitle.setAttribute("font-size","72px"); this.pauseTitle.setAttribute("text-anchor","middle");
       this.pauseGroup.append(this.pauseBg, this.pauseTitle);
+      this.pauseGroup.setAttribute("pointer-events","none");
       LAYER_OVERLAY.appendChild(this.pauseGroup);
       this.pauseGroup.setAttribute("display","none");
+      this.pauseShown = false;
 
       this.title = document.createElementNS(SVGNS,"text");
       this.title.textContent = "Camcookie Dirt Dash";
       this.title.setAttribute("x", VPW/2); this.title.setAttribute("y", VPH/2-200);
       this.title.setAttribute("fill","#e6f2ff"); this.title.setAttribute("font-size","96px"); this.title.setAttribute("text-anchor","middle");
+      this.title.setAttribute("pointer-events","none");
       LAYER_OVERLAY.appendChild(this.title);
+      this.titleShown = true;
 
       this.resultsGroup = document.createElementNS(SVGNS,"g");
       this.resultsBg = document.createElementNS(SVGNS,"rect");
@@ -429,43 +576,74 @@
       this.resultsTitle.setAttribute("x", VPW/2); this.resultsTitle.setAttribute("y", 200);
       this.resultsTitle.setAttribute("fill","#e6f2ff"); this.resultsTitle.setAttribute("font-size","72px"); this.resultsTitle.setAttribute("text-anchor","middle");
       this.resultsList = [];
-      this.resultsGroup.append(this.resultsBg, this.resultsTitle);
+      this.bestText = document.createElementNS(SVGNS,"text");
+      this.bestText.setAttribute("x", VPW/2);
+      this.bestText.setAttribute("fill","#a8ffcf"); this.bestText.setAttribute("font-size","40px"); this.bestText.setAttribute("text-anchor","middle");
+      this.btnRestart = new Button(VPW/2-460, 0, 420, 100, "Replay", s=>{ if (s==="up") window.camcookie.game.restart(); });
+      this.btnHome = new Button(VPW/2+40, 0, 420, 100, "Home", s=>{ if (s==="up") window.camcookie.game.toHome(); });
+      this.resultsGroup.append(this.resultsBg, this.resultsTitle, this.bestText,
+        this.btnRestart.rect, this.btnRestart.text, this.btnHome.rect, this.btnHome.text);
       LAYER_OVERLAY.appendChild(this.resultsGroup);
       this.resultsGroup.setAttribute("display","none");
 
       this.victoryText = document.createElementNS(SVGNS,"text");
       this.victoryText.setAttribute("x", VPW/2); this.victoryText.setAttribute("y", 280);
       this.victoryText.setAttribute("fill","#fff3b0"); this.victoryText.setAttribute("font-size","84px"); this.victoryText.setAttribute("text-anchor","middle");
+      this.victoryText.setAttribute("pointer-events","none");
       LAYER_OVERLAY.appendChild(this.victoryText);
     }
-    showCurtain(a){ this.curtain.setAttribute("opacity", String(a)); }
-    showPause(show){ this.pauseGroup.setAttribute("display", show ? "block":"none"); }
-    setCenter(txt){ this.centerText.textContent = txt || ""; }
+    // State setters remember what they last wrote and skip repeats.
+    showTitle(show){
+      if (show === this.titleShown) return;
+      this.title.setAttribute("display", show ? "block":"none"); this.titleShown = show;
+    }
+    showCurtain(a){
+      if (a === this.curtainShown) return;
+      this.curtain.setAttribute("opacity", String(a)); this.curtainShown = a;
+    }
+    showPause(show){
+      if (show === this.pauseShown) return;
+      this.pauseGroup.setAttribute("display", show ? "block":"none"); this.pauseShown = show;
+    }
+    setCenter(txt){
+      txt = txt || "";
+      if (txt === this.centerShown) return;
+      this.centerText.textContent = txt;
+      this.centerShown = txt;
+    }
+    // Result rows, the best-time line and the two buttons are created once
+    // and reused across races; only their text, colour and y change.
     showResults(rows, highlightName, bestMs=null, playerWon=false) {
       this.resultsGroup.setAttribute("display","block");
-      this.resultsList.forEach(n=>n.remove()); this.resultsList = [];
       let y = 280;
       rows.forEach(([name, ms], i) => {
-        const t = document.createElementNS(SVGNS,"text");
+        let t = this.resultsList[i];
+        if (!t) {
+          t = document.createElementNS(SVGNS,"text");
+          t.setAttribute("x", VPW/2);
+          t.setAttribute("font-size","46px"); t.setAttribute("text-anchor","middle");
+          this.resultsGroup.insertBefore(t, this.bestText);
+          this.resultsList.push(t);
+        }
         t.textContent = `${i+1}. ${name} — ${fmtTimeMs(ms)}`;
-        t.setAttribute("x", VPW/2); t.setAttribute("y", y);
+        t.setAttribute("y", y);
         t.setAttribute("fill", name===highlightName ? "#fff6cc" : "#cfe0ff");
-        t.setAttribute("font-size","46px"); t.setAttribute("text-anchor","middle");
-        this.resultsGroup.appendChild(t); this.resultsList.push(t); y += 58;
+        t.setAttribute("display","block");
+        y += 58;
       });
+      for (let i = rows.length; i < this.resultsList.length; i++) this.resultsList[i].setAttribute("display","none");
       y += 20;
       if (bestMs != null) {
-        const best = document.createElementNS(SVGNS,"text");
-        best.textContent = `Best time: ${fmtTimeMs(bestMs)}`;
-        best.setAttribute("x", VPW/2); best.setAttribute("y", y);
-        best.setAttribute("fill","#a8ffcf"); best.setAttribute("font-size","40px"); best.setAttribute("text-anchor","middle");
-        this.resultsGroup.appendChild(best); this.resultsList.push(best); y += 56;
+        this.bestText.textContent = `Best time: ${fmtTimeMs(bestMs)}`;
+        this.bestText.setAttribute("y", y);
+        this.bestText.setAttribute("display","block");
+        y += 56;
+      } else {
+        this.bestText.setAttribute("display","none");
       }
-      this.btnRestart = new Button(VPW/2-460, y, 420, 100, "Replay", s=>{ if (s==="up") window.camcookie.game.restart(); });
-      this.btnHome = new Button(VPW/2+40, y, 420, 100, "Home", s=>{ if (s==="up") window.camcookie.game.toHome(); });
+      this.btnRestart.moveTo(VPW/2-460, y);
+      this.btnHome.moveTo(VPW/2+40, y);
       this.victoryText.textContent = playerWon ? "Victory!" : "";
-      // Move those two buttons visually atop results group:
-      this.resultsGroup.append(this.btnRestart.rect, this.btnRestart.text, this.btnHome.rect, this.btnHome.text);
     }
     hideResults(){ this.resultsGroup.setAttribute("display","none"); this.victoryText.textContent=""; }
   }
@@ -477,13 +655,21 @@
       this.name = "Player";
       this.bestTimeMs = this.loadBest();
       this.cameraX = 0;
+      this.prevCameraX = 0;
       this.paused = false;
       this.engineOn = false;
+      this.engineShown = false;
       this.muted = MUTE_DEFAULT;
 
+      // Camera
+      this.camTf = rootSvg.createSVGTransform();
+      LAYER_WORLD.transform.baseVal.appendItem(this.camTf);
+      this.drawnCamX = NaN;
+
       // Terrain
       this.terrainPoly = document.createElementNS(SVGNS,"polygon");
       this.terrainPoly.setAttribute("fill","#37465e"); this.terrainPoly.setAttribute("stroke","#1a2333"); this.terrainPoly.setAttribute("stroke-width",2);
+      this.terrainPoly.setAttribute("points", this.buildTerrainPoints());
       LAYER_TERRAIN.appendChild(this.terrainPoly);
 
       // Obstacles
@@ -514,24 +700,38 @@
 
       // Countdown
       this.countdownStartMs = null;
-      this.raceStartMs = null;
+      this.countdownShown = null;
+      this.raceMs = 0;
+      this.goUntilMs = null;
+      this.finishAnnounced = false;
+      this.unfinished = 0;
 
       // Loop
       this._lastT = nowMs();
-      requestAnimationFrame(()=>this.loop());
+      this.accumMs = 0;
+      this._frame = (ts)=>this.loop(ts);
+      this._tick = ()=>this.loop(nowMs());
+      this._timer = null;
+      this.scheduleFrame();
 
       // Unlock audio on any pointer
       rootSvg.addEventListener("pointerdown", ()=>SOUND.unlock(), { passive:true });
+
+      // Leaving the tab mid-race pauses it rather than racing on unseen
+      document.addEventListener("visibilitychange", () => {
+        if (document.hidden) this.setPaused(true);
+      });
     }
 
     buildHomeUI() {
-      const cont = document.getElementById("home-ui");
+      const cont = this.homeUi = document.getElementById("home-ui");
       cont.style.display = "flex";
       cont.innerHTML = "";
       const label = document.createElement("div");
       label.textContent = "Enter name"; label.style.color="#e6f2ff"; label.style.fontSize="24px";
       const input = document.createElement("input"); input.placeholder="Your name";
       const start = document.createElement("button"); start.textContent = "Start Race";
+      const mute = document.createElement("button");
       mute.textContent = this.muted ? "Mute: On" : "Mute: Off";
       mute.addEventListener("click", () => {
         this.muted = !this.muted;
@@ -552,20 +752,88 @@
       this.nameInput = input;
     }
 
+    loadBest() {
+      try {
+        const v = parseFloat(localStorage.getItem(BEST_KEY));
+        return Number.isFinite(v) ? v : null;
+      } catch(e) { return null; }
+    }
+
+    saveBest(ms) {
+      this.bestTimeMs = ms;
+      try { localStorage.setItem(BEST_KEY, String(ms)); } catch(e){}
+    }
+
+    makeStartGrid() {
+      const g = document.createElementNS(SVGNS,"g");
+      g.setAttribute("pointer-events","none");
+      const gy = terrainY(90);
+      for (let row = 0; row < 8; row++) {
+        for (let col = 0; col < 2; col++) {
+          const cell = document.createElementNS(SVGNS,"rect");
+          cell.setAttribute("x", 80 + col*16); cell.setAttribute("y", gy - 128 + row*16);
+          cell.setAttribute("width",16); cell.setAttribute("height",16);
+          cell.setAttribute("fill", (row + col) % 2 ? "#0b0e14" : "#eef6ff");
+          g.appendChild(cell);
+        }
+      }
+      return g;
+    }
+
+    makeButtons() {
+      const hold = (key) => (s) => {
+        if (this.state !== "race" || this.paused) { this[key] = false; return; }
+        this[key] = (s === "down");
+      };
+      this.btnBrake = new Button(40, VPH-200, 320, 160, "Brake", hold("brakeDown"));
+      this.btnJump = new Button(VPW-720, VPH-200, 320, 160, "Jump", hold("jumpDown"));
+      this.btnGas = new Button(VPW-360, VPH-200, 320, 160, "Gas", hold("throttleDown"));
+      this.btnPause = new Button(VPW/2-340, 24, 300, 90, "Pause", s=>{ if (s==="up") this.togglePause(); });
+      this.btnEngine = new Button(VPW/2+20, 24, 340, 90, "Engine: Off", s=>{ if (s==="up") this.toggleEngine(); });
+    }
+
+    // Terrain is static for the session: the polygon is built once and the
+    // camera scrolls LAYER_WORLD instead of rewriting the points.
+    buildTerrainPoints() {
+      const pts = [];
+      const stride = TERRAIN_STEP / TERRAIN_SAMPLE;
+      const end = TRACK_LEN + VPW;
+      for (let x = 0, i = 0; x <= end; x += TERRAIN_STEP, i += stride) {
+        pts.push(`${x},${TERRAIN_TABLE[i].toFixed(0)}`);
+      }
+      pts.push(`${end},${VPH}`, `0,${VPH}`);
+      return pts.join(" ");
+    }
+
+    // The camera snaps to half pixels so static world geometry is not
+    // re-rasterised for invisible sub-pixel moves; unchanged means no write.
+    applyCamera(x = this.cameraX) {
+      const cx = Math.round(x * 2) / 2;
+      if (cx === this.drawnCamX) return;
+      this.camTf.setTranslate(-cx, 0);
+      this.drawnCamX = cx;
+    }
+
     toStartState() {
       this.player.reset();
-      this.bots.forEach(b => b.group.remove());
-      this.bots = [];
-      const palette = ["#ffa07a", "#a2ff9c", "#ffda7f", "#caa0ff", "#9fe0ff"];
-      for (let i = 0; i < BOT_COUNT; i++) {
-        const bot = new Bike(`Bot ${i + 1}`, palette[i % palette.length], true);
-        this.bots.push(bot);
+      // Bots are created for the first race and reset for every later one.
+      if (this.bots.length) {
+        this.bots.forEach(b => b.reset());
+      } else {
+        const palette = ["#ffa07a", "#a2ff9c", "#ffda7f", "#caa0ff", "#9fe0ff"];
+        for (let i = 0; i < BOT_COUNT; i++) {
+          this.bots.push(new Bike(`Bot ${i + 1}`, palette[i % palette.length], true));
+        }
       }
 
       this.finishAnnounced = false;
-      this.raceStartMs = null;
+      this.unfinished = 1 + this.bots.length;
+      this.goUntilMs = null;
+      this.raceMs = 0;
       this.countdownStartMs = null;
       this.cameraX = 0;
+      this.prevCameraX = 0;
+      this.applyCamera();
       this.state = "countdown";
       this.paused = false;
 
@@ -573,23 +841,218 @@
       this.ui.setCenter("");
       this.ui.showCurtain(0.35);
       this.ui.hideResults();
+      this.ui.showPause(false);
+      this.ui.showTitle(false);
       this.refreshEngineButton();
+      this.wake();
     }
 
     beginCountdown() {
       this.countdownStartMs = nowMs();
+      this.countdownShown = null;
       SOUND.engineOff();
       SOUND.countdownBeep(false);
     }
 
+    togglePause() {
+      if (this.state !== "race") return;
+      SOUND.click();
+      this.setPaused(!this.paused);
+    }
+
+    // Silent pause path; togglePause() adds the click for user input.
+    setPaused(paused) {
+      if (this.state !== "race" || paused === this.paused) return;
+      this.paused = paused;
+      if (paused) {
+        this.throttleDown = false; this.brakeDown = false; this.jumpDown = false;
+        SOUND.engineOff();
+      } else {
+        if (this.engineOn) SOUND.engineOn();
+        this.wake();
+      }
+      this.ui.showPause(this.paused);
+      this.ui.showCurtain(this.paused ? 0.5 : 0.0);
+    }
+
+    toggleEngine() {
+      SOUND.click();
+      this.engineOn = !this.engineOn;
+      if (this.engineOn && this.state === "race" && !this.paused) SOUND.engineOn();
+      else SOUND.engineOff();
+      this.refreshEngineButton();
+    }
+
+    restart() {
+      SOUND.click();
+      this.toStartState();
+      this.beginCountdown();
+    }
+
+    toHome() {
+      SOUND.click();
+      SOUND.engineOff();
+      this.state = "home";
+      this.paused = false;
+      this.ui.hideResults();
+      this.ui.showPause(false);
+      this.ui.setCenter("");
+      this.ui.showCurtain(0.0);
+      this.ui.showTitle(true);
+      this.grid.setAttribute("display", "none");
+      this.nameInput.value = this.name === "Player" ? "" : this.name;
+      this.homeUi.style.display = "flex";
+    }
+
+    // -------------------- Frame loop --------------------
+    // Driven by requestAnimationFrame: vsync-aligned, throttled in hidden
+    // tabs, and the callback timestamp (monotonic, like performance.now)
+    // serves as the frame clock. Physics constants are tuned per 60 Hz
+    // tick, so simulation advances in fixed steps from an accumulator;
+    // long stalls are capped so a backgrounded tab does not replay seconds
+    // of physics or tunnel through obstacles on return.
+    loop(ts) {
+      if (document.hidden) {
+        this._lastT = ts;
+        this.scheduleFrame();
+        return;
+      }
+      if (this.isIdle()) {
+        this._lastT = ts;
+        this.accumMs = 0;
+        this.render(1);
+        this.scheduleFrame();
+        return;
+      }
+      const dt = clamp(ts - this._lastT, 0, MAX_FRAME_MS);
+      this._lastT = ts;
+      this.accumMs += dt;
+      // Each step runs at its own point in the frame, not at the frame time.
+      while (this.accumMs >= FIXED_DT_MS) {
+        this.update(FIXED_DT_MS, ts - this.accumMs + FIXED_DT_MS);
+        this.accumMs -= FIXED_DT_MS;
+      }
+      this.render(this.accumMs / FIXED_DT_MS);
+      this.scheduleFrame();
+    }
+
+    // Menus, pause and results have nothing to simulate; the loop drops to
+    // a slow timer there and returns to rAF once a race is running.
+    isIdle() {
+      return this.state === "home" || this.state === "results" || this.paused;
+    }
+
+    // ?timerloop in the page URL swaps rAF for a 60 Hz timer, for
+    // comparing frame pacing on low-end devices.
+    scheduleFrame() {
+      this._timer = null;
+      if (this.isIdle()) this._timer = setTimeout(this._tick, IDLE_FRAME_MS);
+      else if (TIMER_LOOP) this._timer = setTimeout(this._tick, FIXED_DT_MS);
+      else requestAnimationFrame(this._frame);
+    }
+
+    // Leaving an idle state swaps the pending slow timer for a frame now,
+    // with a fresh clock so the wait does not turn into catch-up ticks.
+    wake() {
+      if (this._timer === null) return;  // a frame is already queued
+      clearTimeout(this._timer);
+      this._lastT = nowMs();
+      this.accumMs = 0;
+      this.scheduleFrame();
+    }
+
+    update(dtMs, t) {
+      if (this.state === "countdown") this.updateCountdown(t);
+      else if (this.state === "race" && !this.paused) this.updateRace(dtMs, t);
+    }
+
+    updateCountdown(t) {
+      const left = COUNTDOWN_MS - (t - this.countdownStartMs);
+      if (left <= 0) {
+        this.state = "race";
+        this.raceMs = 0;
+        this.goUntilMs = t + 700;
+        this.grid.setAttribute("display", "none");
+        this.ui.showCurtain(0.0);
+        this.ui.setCenter("Go!");
+        SOUND.countdownBeep(true);
+        if (this.engineOn) SOUND.engineOn();
+        return;
+      }
+      const shown = String(Math.min(3, Math.ceil(left / 1000)));
+      if (shown !== this.countdownShown) {
+        if (this.countdownShown !== null) SOUND.countdownBeep(false);
+        this.countdownShown = shown;
+        this.ui.setCenter(shown);
+      }
+    }
+
+    updateRace(dtMs, t) {
+      if (this.goUntilMs !== null && t >= this.goUntilMs) { this.goUntilMs = null; this.ui.setCenter(""); }
+      const field = this.obsField;
+      // Race time counts simulated ticks, so finish times follow the
+      // physics rather than frame timing, and pauses need no correction.
+      const raceMs = this.raceMs += dtMs;
+      const p = this.player;
+      // One pass per bike: physics, obstacles and finish stamp together.
+      // step() reports each finish once, so the end check is a counter.
+      if (p.step(dtMs, this.throttleDown, this.brakeDown, this.jumpDown, field, raceMs)) this.unfinished--;
+      for (const b of this.bots) {
+        if (b.finished) continue;
+        const [throttle, jump] = b.botDecide(field);
+        if (b.step(dtMs, throttle, false, jump, field, raceMs)) this.unfinished--;
+      }
+      if (p.finished && !this.finishAnnounced) {
+        this.finishAnnounced = true;
+        this.ui.setCenter("Finish!");
+        SOUND.engineOff();
+      }
+
+      const target = clamp(p.x - CAM_LEAD, 0, TRACK_LEN);
+      this.prevCameraX = this.cameraX;
+      this.cameraX += (target - this.cameraX) * CAM_EASE;
+      if (this.engineOn) SOUND.engineSetSpeed(p.vx);
+
+      if (this.unfinished === 0) this.endRace();
+    }
+
+    endRace() {
+      this.state = "results";
+      this.throttleDown = false; this.brakeDown = false; this.jumpDown = false;
+      SOUND.engineOff();
+      const rows = [this.player, ...this.bots]
+        .map(b => [b.name, b.finishTimeMs])
+        .sort((a, b) => a[1] - b[1]);
+      const playerMs = this.player.finishTimeMs;
+      if (this.bestTimeMs === null || playerMs < this.bestTimeMs) this.saveBest(playerMs);
+      const playerWon = rows[0][0] === this.player.name;
+      if (playerWon) SOUND.victory();
+      this.ui.setCenter("");
+      this.ui.showCurtain(0.5);
+      this.ui.showResults(rows, this.player.name, this.bestTimeMs, playerWon);
+    }
+
+    render(alpha) {
+      const cam = this.prevCameraX + (this.cameraX - this.prevCameraX) * alpha;
+      this.player.draw(cam, alpha);
+      for (const b of this.bots) b.draw(cam, alpha);
+      this.applyCamera(cam);
+      let ms = 0;
+      if (this.player.finishTimeMs !== null) ms = this.player.finishTimeMs;
+      else if (this.state === "race") ms = this.raceMs;
+      this.hud.update(ms, this.player.vx, this.name);
+    }
+
     refreshEngineButton() {
+      if (this.engineOn === this.engineShown) return;
+      this.engineShown = this.engineOn;
       const label = this.engineOn ? "Engine: On" : "Engine: Off";
       this.btnEngine.text.textContent = label;
       this.btnEngine.rect.setAttribute("fill", this.engineOn ? "#2f4e75" : "#233246");
     }
 
     startFromSplash() {
-      document.getElementById("home-ui").style.display = "flex";
+      this.homeUi.style.display = "flex";
     }
   }
 